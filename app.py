@@ -1,20 +1,54 @@
 from __future__ import annotations
 
+import gzip
+import hashlib
+import heapq
 import json
 import os
+import queue
 import secrets
 import sqlite3
+import threading
+import time
 import urllib.parse
-import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from itertools import groupby
+from operator import attrgetter
 from pathlib import Path
-from typing import Iterable, Optional
-
-from flask import Flask, redirect, render_template, request, session, url_for
+from typing import Any, Hashable, Iterable, Iterator, NamedTuple, Optional
+
+import click
+import requests
+from flask import (
+    Flask,
+    Response,
+    abort,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup, escape
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 APP_DIR = Path(__file__).resolve().parent
 DB_PATH = APP_DIR / "data.db"
+JINJA_CACHE_DIR = APP_DIR / ".jinja_cache"
 
 CATEGORY_SUGGESTIONS = {
     "科技": ["AI", "编程", "硬件", "数码", "开源"],
@@ -24,16 +58,14 @@ CATEGORY_SUGGESTIONS = {
 }
 
 
-@dataclass
-class Keyword:
+class Keyword(NamedTuple):
     id: int
     term: str
     category: str
     enabled: bool
 
 
-@dataclass
-class UpCreator:
+class UpCreator(NamedTuple):
     id: int
     name: str
     mid: str
@@ -41,16 +73,7 @@ class UpCreator:
     enabled: bool
 
 
-@dataclass
-class ListEntry:
-    id: int
-    name: str
-    mid: str
-    list_type: str
-    enabled: bool
-
-
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Settings:
     send_interval_hours: int
     aggregates_enabled: bool
@@ -62,20 +85,143 @@ class Settings:
 
 app = Flask(__name__)
 app.secret_key = os.environ.get("BILIBILI_HELPER_SECRET") or secrets.token_hex(32)
+JINJA_CACHE_DIR.mkdir(exist_ok=True)
+app.jinja_options = {
+    **app.jinja_options,
+    "bytecode_cache": FileSystemBytecodeCache(str(JINJA_CACHE_DIR)),
+}
+
+BILI_SESSION_TTL_SECONDS = 8 * 3600
+BILI_SESSION_MAXSIZE = 10_000
+BILI_SESSION_STORE: OrderedDict[str, tuple[float, dict[str, str]]] = OrderedDict()
+_BILI_SESSION_LOCK = threading.Lock()
+
+BILI_HTTP_POOL_MAXSIZE = 32
+GZIP_MIN_SIZE = 1024
+BILI_UPDATE_WORKERS = min(8, BILI_HTTP_POOL_MAXSIZE)
+
+
+def create_http_session() -> requests.Session:
+    client = requests.Session()
+    client.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    client.headers.update(
+        {
+            "User-Agent": "BILIBILI-Helper/1.0",
+            "Referer": "https://www.bilibili.com/",
+        }
+    )
+    client.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=BILI_HTTP_POOL_MAXSIZE,
+            max_retries=Retry(total=2, backoff_factor=0.2),
+        ),
+    )
+    return client
+
+
+_HTTP = create_http_session()
 
-BILI_SESSION_STORE: dict[str, dict[str, str]] = {}
+_MISSING = object()
 
 
-def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+class TTLCache:
+    def __init__(self, ttl: float, maxsize: int = 1024) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return default
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                for stale in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+                    del self._entries[stale]
+                while len(self._entries) >= self.maxsize:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (now + self.ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+FOLLOWINGS_CACHE = TTLCache(ttl=60)
+LATEST_VIDEO_CACHE = TTLCache(ttl=300)
+
+
+def sessdata_digest(sessdata: Optional[str]) -> bytes:
+    return hashlib.blake2b((sessdata or "").encode(), digest_size=8).digest()
+
+
+def clear_bili_caches() -> None:
+    FOLLOWINGS_CACHE.clear()
+    LATEST_VIDEO_CACHE.clear()
+
+
+def open_connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=134217728")
     return conn
 
 
+DB_POOL_SIZE = 8
+SQLITE_INTEGER_RANGE = range(-(2**63), 2**63)
+_DB_POOL: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+app.extensions["sqlite_pool"] = _DB_POOL
+
+
+@contextmanager
+def get_connection() -> Iterator[sqlite3.Connection]:
+    try:
+        conn = _DB_POOL.get_nowait()
+    except queue.Empty:
+        conn = open_connection()
+    try:
+        yield conn
+    except BaseException:
+        conn.close()
+        raise
+    try:
+        _DB_POOL.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+
+def compute_index_etag(*parts: object) -> str:
+    raw = "|".join(str(part) for part in parts)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+SCHEMA_VERSION = 1
+STATE_TRACKED_TABLES = ("keywords", "up_creators", "list_entries", "settings")
+
+
 def init_db() -> None:
-    with get_connection() as conn:
+    with closing(open_connection()) as conn:
         conn.executescript(
             """
+            CREATE TABLE IF NOT EXISTS app_state (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL DEFAULT 0
+            );
+
             CREATE TABLE IF NOT EXISTS keywords (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 term TEXT NOT NULL,
@@ -108,6 +254,45 @@ def init_db() -> None:
                 email_recipients TEXT NOT NULL DEFAULT '',
                 wechat_webhook TEXT NOT NULL DEFAULT ''
             );
+
+            DELETE FROM up_creators
+            WHERE id != (
+                SELECT keep.id FROM up_creators AS keep
+                WHERE keep.name IS up_creators.name
+                    AND keep.mid IS up_creators.mid
+                    AND keep.tag IS up_creators.tag
+                ORDER BY keep.enabled DESC, keep.id
+                LIMIT 1
+            );
+
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_creators_dedup
+                ON up_creators (name, mid, tag);
+
+            CREATE INDEX IF NOT EXISTS idx_keywords_category_term
+                ON keywords (category, term, id, enabled);
+
+            CREATE INDEX IF NOT EXISTS idx_creators_tag_name
+                ON up_creators (tag, name, id, mid, enabled);
+
+            CREATE INDEX IF NOT EXISTS idx_list_entries_type_name
+                ON list_entries (list_type, name, id, mid, enabled);
+            """
+        )
+        for table in STATE_TRACKED_TABLES:
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                conn.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_bumps_state
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE app_state SET version = version + 1 WHERE id = 1;
+                    END
+                    """
+                )
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO app_state (id)
+            VALUES (1)
             """
         )
         conn.execute(
@@ -116,90 +301,194 @@ def init_db() -> None:
             VALUES (1)
             """
         )
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
 
-init_db()
+def ensure_db() -> None:
+    if DB_PATH.exists():
+        with closing(sqlite3.connect(DB_PATH)) as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                return
+    init_db()
+
+
+@app.cli.command("init-db")
+def init_db_command() -> None:
+    init_db()
+    click.echo("数据库已初始化。")
+
+
+ensure_db()
+
+
+SQL_BEGIN = "BEGIN"
+SQL_BEGIN_IMMEDIATE = "BEGIN IMMEDIATE"
+SQL_FETCH_STATE_VERSION = "SELECT version FROM app_state WHERE id = 1"
+SQL_FETCH_KEYWORDS = """
+    SELECT id, term, category, enabled FROM keywords ORDER BY category, term
+"""
+SQL_FETCH_UP_CREATORS = """
+    SELECT id, name, mid, tag, enabled FROM up_creators ORDER BY tag, name
+"""
+SQL_FETCH_LIST_ENTRIES = """
+    SELECT id, name, mid, list_type, enabled FROM list_entries ORDER BY list_type, name
+"""
+SQL_FETCH_PREVIEW_CREATORS = """
+    SELECT id, name, mid, tag, enabled FROM up_creators WHERE tag = ? AND enabled = 1
+    UNION ALL
+    SELECT id, name, mid, tag, enabled FROM up_creators WHERE tag = ? AND enabled = 1
+    ORDER BY tag DESC, name
+    LIMIT ?
+"""
+SQL_INSERT_CREATOR = """
+    INSERT OR IGNORE INTO up_creators (name, mid, tag, enabled) VALUES (?, ?, ?, 1)
+"""
+SQL_FETCH_SETTINGS = """
+    SELECT send_interval_hours, aggregates_enabled, highlight_special,
+           highlight_paid, email_recipients, wechat_webhook
+    FROM settings WHERE id = 1
+"""
+SQL_UPDATE_SETTINGS = """
+    UPDATE settings
+    SET send_interval_hours = ?,
+        aggregates_enabled = ?,
+        highlight_special = ?,
+        highlight_paid = ?,
+        email_recipients = ?,
+        wechat_webhook = ?
+    WHERE id = 1
+"""
+SQL_INSERT_KEYWORD = "INSERT INTO keywords (term, category, enabled) VALUES (?, ?, 1)"
+SQL_TOGGLE_KEYWORD = "UPDATE keywords SET enabled = 1 - enabled WHERE id = ?"
+SQL_DELETE_KEYWORD = "DELETE FROM keywords WHERE id = ?"
+SQL_TOGGLE_CREATOR = "UPDATE up_creators SET enabled = 1 - enabled WHERE id = ?"
+SQL_DELETE_CREATOR = "DELETE FROM up_creators WHERE id = ?"
+SQL_INSERT_LIST_ENTRY = """
+    INSERT INTO list_entries (name, mid, list_type, enabled) VALUES (?, ?, ?, 1)
+"""
+SQL_TOGGLE_LIST_ENTRY = "UPDATE list_entries SET enabled = 1 - enabled WHERE id = ?"
+SQL_DELETE_LIST_ENTRY = "DELETE FROM list_entries WHERE id = ?"
+
+
+def fetch_state_version(conn: sqlite3.Connection) -> int:
+    return conn.execute(SQL_FETCH_STATE_VERSION).fetchone()[0]
 
 
 def fetch_keywords(conn: sqlite3.Connection) -> list[Keyword]:
-    rows = conn.execute("SELECT * FROM keywords ORDER BY category, term").fetchall()
-    return [Keyword(**row) for row in rows]
+    rows = conn.execute(SQL_FETCH_KEYWORDS).fetchall()
+    return [Keyword._make(row) for row in rows]
 
 
-def fetch_up_creators(conn: sqlite3.Connection) -> list[UpCreator]:
-    rows = conn.execute("SELECT * FROM up_creators ORDER BY tag, name").fetchall()
-    return [UpCreator(**row) for row in rows]
+def fetch_up_creators(conn: sqlite3.Connection) -> list[sqlite3.Row]:
+    return conn.execute(SQL_FETCH_UP_CREATORS).fetchall()
 
 
-def fetch_list_entries(conn: sqlite3.Connection) -> list[ListEntry]:
+def fetch_list_entries(conn: sqlite3.Connection) -> list[sqlite3.Row]:
+    return conn.execute(SQL_FETCH_LIST_ENTRIES).fetchall()
+
+
+def fetch_preview_creators(
+    conn: sqlite3.Connection,
+    settings: Settings,
+    limit: int,
+) -> list[UpCreator]:
     rows = conn.execute(
-        "SELECT * FROM list_entries ORDER BY list_type, name"
+        SQL_FETCH_PREVIEW_CREATORS,
+        (
+            "special" if settings.highlight_special else None,
+            "paid" if settings.highlight_paid else None,
+            limit,
+        ),
     ).fetchall()
-    return [ListEntry(**row) for row in rows]
+    return [UpCreator._make(row) for row in rows]
 
 
 def fetch_settings(conn: sqlite3.Connection) -> Settings:
-    row = conn.execute("SELECT * FROM settings WHERE id = 1").fetchone()
-    return Settings(
-        send_interval_hours=row["send_interval_hours"],
-        aggregates_enabled=bool(row["aggregates_enabled"]),
-        highlight_special=bool(row["highlight_special"]),
-        highlight_paid=bool(row["highlight_paid"]),
-        email_recipients=row["email_recipients"],
-        wechat_webhook=row["wechat_webhook"],
-    )
+    r = conn.execute(SQL_FETCH_SETTINGS).fetchone()
+    return Settings(r[0], bool(r[1]), bool(r[2]), bool(r[3]), r[4], r[5])
+
+
+TRUTHY_VALUES = frozenset({"1", "true", "on", "yes"})
 
 
 def parse_bool(value: Optional[str]) -> bool:
-    return value in {"1", "true", "on", "yes"}
+    return value in TRUTHY_VALUES
 
 
-def grouped_keywords(keywords: Iterable[Keyword]) -> dict[str, list[Keyword]]:
-    grouped: dict[str, list[Keyword]] = {}
-    for keyword in keywords:
-        grouped.setdefault(keyword.category, []).append(keyword)
-    return grouped
+def summarize_keywords(
+    keywords: Iterable[Keyword],
+) -> tuple[dict[str, list[Keyword]], list[str]]:
+    # Keywords arrive ordered by category (SQL_FETCH_KEYWORDS), so each
+    # category is one contiguous run.
+    grouped = {
+        category: list(group)
+        for category, group in groupby(keywords, key=attrgetter("category"))
+    }
+    categories = set(grouped)
+    categories.add("默认")
+    return grouped, sorted(categories)
+
+
+_keyword_summary_cache: tuple[int, tuple[dict[str, list[Keyword]], list[str]]] = (
+    -1,
+    ({}, []),
+)
+
+
+def cached_keyword_summary(
+    keywords: list[Keyword],
+    version: int,
+) -> tuple[dict[str, list[Keyword]], list[str]]:
+    global _keyword_summary_cache
+    if _keyword_summary_cache[0] == version:
+        return _keyword_summary_cache[1]
+    summary = summarize_keywords(keywords)
+    _keyword_summary_cache = (version, summary)
+    return summary
+
+
+PREVIEW_CREATOR_LABELS = {
+    "special": (Markup("特别关注 UP 主更新"), Markup("特别关注")),
+    "paid": (Markup("付费关注 UP 主更新"), Markup("付费")),
+}
+_preview_cache: tuple[tuple[int, str], list[dict[str, str]]] = ((-1, ""), [])
 
 
 def build_feed_preview(
+    conn: sqlite3.Connection,
     keywords: list[Keyword],
-    creators: list[UpCreator],
     settings: Settings,
+    version: int,
 ) -> list[dict[str, str]]:
-    preview = []
-    now = datetime.now().strftime("%Y-%m-%d %H:%M")
-    for keyword in keywords[:8]:
-        preview.append(
-            {
-                "title": f"[{keyword.category}] 与「{keyword.term}」相关的新视频",
-                "author": "UP主示例",
-                "tag": "",
-                "time": now,
-            }
-        )
-    if settings.highlight_special:
-        for creator in creators:
-            if creator.tag == "special" and creator.enabled:
-                preview.append(
-                    {
-                        "title": "特别关注 UP 主更新",
-                        "author": creator.name,
-                        "tag": "特别关注",
-                        "time": now,
-                    }
-                )
-    if settings.highlight_paid:
-        for creator in creators:
-            if creator.tag == "paid" and creator.enabled:
-                preview.append(
-                    {
-                        "title": "付费关注 UP 主更新",
-                        "author": creator.name,
-                        "tag": "付费",
-                        "time": now,
-                    }
-                )
-    return preview[:10]
+    global _preview_cache
+    now = Markup(datetime.now().strftime("%Y-%m-%d %H:%M"))
+    cache_key = (version, str(now))
+    if _preview_cache[0] == cache_key:
+        return _preview_cache[1]
+    preview = [
+        {
+            "title": Markup("[{}] 与「{}」相关的新视频").format(
+                keyword.category, keyword.term
+            ),
+            "author": Markup("UP主示例"),
+            "tag": Markup(""),
+            "time": now,
+        }
+        for keyword in keywords[:8]
+    ]
+    if settings.highlight_special or settings.highlight_paid:
+        for creator in fetch_preview_creators(conn, settings, 10 - len(preview)):
+            title, tag = PREVIEW_CREATOR_LABELS[creator.tag]
+            preview.append(
+                {
+                    "title": title,
+                    "author": escape(creator.name),
+                    "tag": tag,
+                    "time": now,
+                }
+            )
+    _preview_cache = (cache_key, preview)
+    return preview
 
 
 def create_bili_session(
@@ -209,12 +498,20 @@ def create_bili_session(
     face: str = "",
 ) -> str:
     session_id = secrets.token_urlsafe(32)
-    BILI_SESSION_STORE[session_id] = {
+    data = {
         "display_name": display_name,
         "mid": mid,
         "sessdata": sessdata,
         "face": face,
     }
+    now = time.time()
+    with _BILI_SESSION_LOCK:
+        while BILI_SESSION_STORE:
+            oldest_id, (expires_at, _) = next(iter(BILI_SESSION_STORE.items()))
+            if expires_at > now and len(BILI_SESSION_STORE) < BILI_SESSION_MAXSIZE:
+                break
+            del BILI_SESSION_STORE[oldest_id]
+        BILI_SESSION_STORE[session_id] = (now + BILI_SESSION_TTL_SECONDS, data)
     return session_id
 
 
@@ -222,25 +519,34 @@ def get_bili_session() -> Optional[dict[str, str]]:
     session_id = session.get("bili_session_id")
     if not session_id:
         return None
-    return BILI_SESSION_STORE.get(session_id)
+    now = time.time()
+    with _BILI_SESSION_LOCK:
+        entry = BILI_SESSION_STORE.get(session_id)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del BILI_SESSION_STORE[session_id]
+            return None
+        BILI_SESSION_STORE[session_id] = (now + BILI_SESSION_TTL_SECONDS, entry[1])
+        BILI_SESSION_STORE.move_to_end(session_id)
+        return entry[1]
 
 
 def clear_bili_session() -> None:
     session_id = session.pop("bili_session_id", None)
     if session_id:
-        BILI_SESSION_STORE.pop(session_id, None)
+        with _BILI_SESSION_LOCK:
+            BILI_SESSION_STORE.pop(session_id, None)
 
 
 def fetch_bili_json(url: str, sessdata: Optional[str] = None) -> dict:
-    headers = {
-        "User-Agent": "BILIBILI-Helper/1.0",
-        "Referer": "https://www.bilibili.com/",
-    }
-    if sessdata:
-        headers["Cookie"] = f"SESSDATA={sessdata}"
-    request_obj = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(request_obj, timeout=10) as response:
-        payload = json.loads(response.read().decode("utf-8"))
+    response = _HTTP.get(
+        url,
+        headers={"Cookie": f"SESSDATA={sessdata}"} if sessdata else None,
+        timeout=10,
+    )
+    response.raise_for_status()
+    payload = _json_loads(response.content)
     if payload.get("code") != 0:
         message = payload.get("message") or "请求失败"
         raise RuntimeError(message)
@@ -256,18 +562,25 @@ def fetch_user_profile(sessdata: str) -> dict[str, str]:
     }
 
 
+FOLLOWINGS_PAGE_SIZE = 50
+
+
 def fetch_followings_list(
     mid: str,
     sessdata: str,
     max_pages: int = 3,
 ) -> list[dict[str, str]]:
+    cache_key = (mid, sessdata_digest(sessdata), max_pages)
+    cached = FOLLOWINGS_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     results: list[dict[str, str]] = []
     for page in range(1, max_pages + 1):
         query = urllib.parse.urlencode(
             {
                 "vmid": mid,
                 "pn": page,
-                "ps": 50,
+                "ps": FOLLOWINGS_PAGE_SIZE,
                 "order": "desc",
                 "order_type": "attention",
             }
@@ -278,15 +591,19 @@ def fetch_followings_list(
         if not followings:
             break
         for item in followings:
-            name = str(item.get("uname", "")).strip()
+            name = str(item.get("uname", "")).strip() or "未知UP主"
             item_mid = str(item.get("mid", "")).strip()
             results.append(
                 {
-                    "name": name or "未知UP主",
+                    "name": name,
                     "mid": item_mid or "未知",
                     "special": "1" if item.get("special") == 1 else "0",
+                    "_name_lc": name.lower(),
                 }
             )
+        if len(followings) < FOLLOWINGS_PAGE_SIZE:
+            break
+    FOLLOWINGS_CACHE.set(cache_key, results)
     return results
 
 
@@ -299,18 +616,25 @@ def fetch_followings(
     encoded_keyword = keyword.strip().lower()
     if not encoded_keyword:
         return []
-    results: list[dict[str, str]] = []
-    for item in fetch_followings_list(mid, sessdata, max_pages=max_pages):
-        if encoded_keyword not in item["name"].lower():
-            continue
-        results.append(item)
-    return results
+    return [
+        item
+        for item in fetch_followings_list(mid, sessdata, max_pages=max_pages)
+        if encoded_keyword in item["_name_lc"]
+    ]
+
+
+@lru_cache(maxsize=4096)
+def format_timestamp(ts: int) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
 
 
 def fetch_latest_video(
     mid: str,
     sessdata: Optional[str] = None,
-) -> Optional[dict[str, str]]:
+) -> Optional[dict[str, Any]]:
+    cached = LATEST_VIDEO_CACHE.get(mid, _MISSING)
+    if cached is not _MISSING:
+        return cached
     query = urllib.parse.urlencode(
         {
             "mid": mid,
@@ -321,33 +645,46 @@ def fetch_latest_video(
     )
     url = f"https://api.bilibili.com/x/space/arc/search?{query}"
     data = fetch_bili_json(url, sessdata)
-    vlist = (data.get("list") or {}).get("vlist") or []
+    try:
+        vlist = data["list"]["vlist"] or []
+    except (KeyError, TypeError):
+        vlist = []
     if not vlist:
+        LATEST_VIDEO_CACHE.set(mid, None)
         return None
     item = vlist[0]
-    created_ts = int(item.get("created") or 0)
-    return {
-        "title": str(item.get("title", "")).strip() or "未命名视频",
-        "created": datetime.fromtimestamp(created_ts).strftime("%Y-%m-%d %H:%M"),
-        "created_ts": str(created_ts),
-        "bvid": str(item.get("bvid", "")).strip(),
-        "author": str(item.get("author", "")).strip(),
-        "link": f"https://www.bilibili.com/video/{item.get('bvid')}"
-        if item.get("bvid")
-        else "",
+    bvid = item.get("bvid") or ""
+    created_ts = item.get("created") or 0
+    latest = {
+        "title": (item.get("title") or "").strip() or "未命名视频",
+        "created": format_timestamp(created_ts),
+        "created_ts": created_ts,
+        "bvid": bvid,
+        "author": item.get("author") or "",
+        "link": f"https://www.bilibili.com/video/{bvid}" if bvid else "",
     }
+    LATEST_VIDEO_CACHE.set(mid, latest)
+    return latest
 
 
 def fetch_following_updates(
     mid: str,
     sessdata: str,
     limit: int = 20,
-) -> list[dict[str, str]]:
-    followings = fetch_followings_list(mid, sessdata, max_pages=2)
-    updates: list[dict[str, str]] = []
-    for item in followings[: max(limit, 1)]:
+) -> list[dict[str, Any]]:
+    followings = fetch_followings_list(mid, sessdata, max_pages=2)[: max(limit, 1)]
+    updates: list[dict[str, Any]] = []
+    if not followings:
+        return updates
+    workers = min(BILI_UPDATE_WORKERS, len(followings))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            (item, executor.submit(fetch_latest_video, item["mid"], sessdata))
+            for item in followings
+        ]
+    for item, future in futures:
         try:
-            latest = fetch_latest_video(item["mid"], sessdata)
+            latest = future.result()
         except Exception:
             continue
         if not latest:
@@ -360,8 +697,26 @@ def fetch_following_updates(
                 "special": item["special"],
             }
         )
-    updates.sort(key=lambda x: int(x.get("created_ts", "0")), reverse=True)
-    return updates[:limit]
+    return heapq.nlargest(max(limit, 0), updates, key=lambda x: x["created_ts"])
+
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    if (
+        response.direct_passthrough
+        or response.status_code != 200
+        or "Content-Encoding" in response.headers
+        or not response.mimetype.startswith("text/")
+        or not request.accept_encodings["gzip"]
+    ):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
 
 
 @app.route("/")
@@ -372,66 +727,109 @@ def index():
     search_error = ""
     followings: list[dict[str, str]] = []
     followings_error = ""
-    updates: list[dict[str, str]] = []
+    updates: list[dict[str, Any]] = []
     updates_error = ""
     login_error = session.pop("login_error", "")
 
-    if account and search_keyword:
-        try:
-            search_results = fetch_followings(
-                account["mid"],
-                account["sessdata"],
-                search_keyword,
-            )
-        except Exception:
-            search_error = "搜索失败，请检查 SESSDATA 是否有效或稍后重试。"
-
     if account:
-        try:
-            followings = fetch_followings_list(
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            search_future = (
+                executor.submit(
+                    fetch_followings,
+                    account["mid"],
+                    account["sessdata"],
+                    search_keyword,
+                )
+                if search_keyword
+                else None
+            )
+            followings_future = executor.submit(
+                fetch_followings_list,
                 account["mid"],
                 account["sessdata"],
                 max_pages=1,
             )
-        except Exception:
-            followings_error = "关注列表拉取失败，请稍后重试。"
-        try:
-            updates = fetch_following_updates(
+            updates_future = executor.submit(
+                fetch_following_updates,
                 account["mid"],
                 account["sessdata"],
                 limit=12,
             )
+        if search_future is not None:
+            try:
+                search_results = search_future.result()
+            except Exception:
+                search_error = "搜索失败，请检查 SESSDATA 是否有效或稍后重试。"
+        try:
+            followings = followings_future.result()
+        except Exception:
+            followings_error = "关注列表拉取失败，请稍后重试。"
+        try:
+            updates = updates_future.result()
         except Exception:
             updates_error = "关注更新拉取失败，请稍后重试。"
 
     with get_connection() as conn:
-        keywords = fetch_keywords(conn)
-        creators = fetch_up_creators(conn)
-        list_entries = fetch_list_entries(conn)
-        settings = fetch_settings(conn)
-
-    preview = build_feed_preview(keywords, creators, settings)
-
-    return render_template(
-        "index.html",
-        keywords=keywords,
-        keyword_groups=grouped_keywords(keywords),
-        creators=creators,
-        list_entries=list_entries,
-        settings=settings,
-        categories=sorted({"默认"} | {kw.category for kw in keywords}),
-        category_suggestions=CATEGORY_SUGGESTIONS,
-        preview=preview,
-        account=account,
-        search_keyword=search_keyword,
-        search_results=search_results,
-        search_error=search_error,
-        followings=followings,
-        followings_error=followings_error,
-        updates=updates,
-        updates_error=updates_error,
-        login_error=login_error,
-    )
+        # One read transaction, so the version behind the ETag and the preview
+        # memo key describes exactly the rows rendered below.
+        conn.execute(SQL_BEGIN)
+        with conn:
+            version = fetch_state_version(conn)
+            etag = compute_index_etag(
+                version,
+                # Digest what is rendered rather than per-worker state, so any
+                # worker answers the same If-None-Match the same way.
+                account and (account["mid"], account["display_name"], account["face"]),
+                search_keyword,
+                search_results,
+                followings,
+                updates,
+                login_error,
+                search_error,
+                followings_error,
+                updates_error,
+                datetime.now().strftime("%Y-%m-%d %H:%M"),
+            )
+            not_modified = request.if_none_match.contains_weak(etag)
+            if not not_modified:
+                keywords = fetch_keywords(conn)
+                creators = fetch_up_creators(conn)
+                list_entries = fetch_list_entries(conn)
+                settings = fetch_settings(conn)
+                preview = build_feed_preview(conn, keywords, settings, version)
+
+    if not_modified:
+        response = Response(status=304)
+    else:
+        keyword_groups, categories = cached_keyword_summary(keywords, version)
+
+        response = make_response(
+            render_template(
+                "index.html",
+                keywords=keywords,
+                keyword_groups=keyword_groups,
+                creators=creators,
+                list_entries=list_entries,
+                settings=settings,
+                categories=categories,
+                category_suggestions=CATEGORY_SUGGESTIONS,
+                preview=preview,
+                account=account,
+                search_keyword=search_keyword,
+                search_results=search_results,
+                search_error=search_error,
+                followings=followings,
+                followings_error=followings_error,
+                updates=updates,
+                updates_error=updates_error,
+                login_error=login_error,
+            )
+        )
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.max_age = 0
+    response.cache_control.must_revalidate = True
+    return response
 
 
 @app.route("/keywords/add", methods=["POST"])
@@ -440,27 +838,48 @@ def add_keyword():
     category = request.form.get("category", "默认").strip() or "默认"
     if term:
         with get_connection() as conn:
-            conn.execute(
-                "INSERT INTO keywords (term, category, enabled) VALUES (?, ?, 1)",
-                (term, category),
-            )
+            conn.execute(SQL_INSERT_KEYWORD, (term, category))
     return redirect(url_for("index"))
 
 
 @app.route("/keywords/<int:keyword_id>/toggle", methods=["POST"])
 def toggle_keyword(keyword_id: int):
     with get_connection() as conn:
-        conn.execute(
-            "UPDATE keywords SET enabled = 1 - enabled WHERE id = ?",
-            (keyword_id,),
-        )
+        conn.execute(SQL_TOGGLE_KEYWORD, (keyword_id,))
     return redirect(url_for("index"))
 
 
 @app.route("/keywords/<int:keyword_id>/delete", methods=["POST"])
 def delete_keyword(keyword_id: int):
     with get_connection() as conn:
-        conn.execute("DELETE FROM keywords WHERE id = ?", (keyword_id,))
+        conn.execute(SQL_DELETE_KEYWORD, (keyword_id,))
+    return redirect(url_for("index"))
+
+
+@app.route("/keywords/delete-batch", methods=["POST"])
+def delete_keywords_batch():
+    raw_ids = request.get_json(silent=True)
+    if raw_ids is None:
+        try:
+            raw_ids = [
+                int(keyword_id)
+                if keyword_id.isascii() and keyword_id.isdigit()
+                else None
+                for keyword_id in request.form.getlist("keyword_id")
+            ]
+        except ValueError:
+            abort(400)
+    if not isinstance(raw_ids, list) or not all(
+        type(keyword_id) is int and keyword_id in SQLITE_INTEGER_RANGE
+        for keyword_id in raw_ids
+    ):
+        abort(400)
+    keyword_ids = [(keyword_id,) for keyword_id in raw_ids]
+    if keyword_ids:
+        with get_connection() as conn:
+            conn.execute(SQL_BEGIN_IMMEDIATE)
+            with conn:
+                conn.executemany(SQL_DELETE_KEYWORD, keyword_ids)
     return redirect(url_for("index"))
 
 
@@ -475,16 +894,7 @@ def update_settings():
 
     with get_connection() as conn:
         conn.execute(
-            """
-            UPDATE settings
-            SET send_interval_hours = ?,
-                aggregates_enabled = ?,
-                highlight_special = ?,
-                highlight_paid = ?,
-                email_recipients = ?,
-                wechat_webhook = ?
-            WHERE id = 1
-            """,
+            SQL_UPDATE_SETTINGS,
             (
                 send_interval_hours,
                 int(aggregates_enabled),
@@ -512,6 +922,7 @@ def account_login():
         return redirect(url_for("index"))
 
     clear_bili_session()
+    clear_bili_caches()
     session["bili_session_id"] = create_bili_session(
         profile["display_name"],
         profile["mid"],
@@ -524,6 +935,7 @@ def account_login():
 @app.route("/account/logout", methods=["POST"])
 def account_logout():
     clear_bili_session()
+    clear_bili_caches()
     return redirect(url_for("index"))
 
 
@@ -534,10 +946,7 @@ def add_creator():
     tag = request.form.get("tag", "special")
     if name:
         with get_connection() as conn:
-            conn.execute(
-                "INSERT INTO up_creators (name, mid, tag, enabled) VALUES (?, ?, ?, 1)",
-                (name, mid, tag),
-            )
+            conn.execute(SQL_INSERT_CREATOR, (name, mid, tag))
     return redirect(url_for("index"))
 
 
@@ -549,35 +958,21 @@ def add_creator_from_account():
     search_keyword = request.form.get("search_keyword", "").strip()
     if name:
         with get_connection() as conn:
-            existing = conn.execute(
-                """
-                SELECT 1 FROM up_creators
-                WHERE name = ? AND mid = ? AND tag = ?
-                """,
-                (name, mid, tag),
-            ).fetchone()
-            if not existing:
-                conn.execute(
-                    "INSERT INTO up_creators (name, mid, tag, enabled) VALUES (?, ?, ?, 1)",
-                    (name, mid, tag),
-                )
+            conn.execute(SQL_INSERT_CREATOR, (name, mid, tag))
     return redirect(url_for("index", search=search_keyword))
 
 
 @app.route("/creators/<int:creator_id>/toggle", methods=["POST"])
 def toggle_creator(creator_id: int):
     with get_connection() as conn:
-        conn.execute(
-            "UPDATE up_creators SET enabled = 1 - enabled WHERE id = ?",
-            (creator_id,),
-        )
+        conn.execute(SQL_TOGGLE_CREATOR, (creator_id,))
     return redirect(url_for("index"))
 
 
 @app.route("/creators/<int:creator_id>/delete", methods=["POST"])
 def delete_creator(creator_id: int):
     with get_connection() as conn:
-        conn.execute("DELETE FROM up_creators WHERE id = ?", (creator_id,))
+        conn.execute(SQL_DELETE_CREATOR, (creator_id,))
     return redirect(url_for("index"))
 
 
@@ -588,30 +983,21 @@ def add_list_entry():
     list_type = request.form.get("list_type", "whitelist")
     if name:
         with get_connection() as conn:
-            conn.execute(
-                """
-                INSERT INTO list_entries (name, mid, list_type, enabled)
-                VALUES (?, ?, ?, 1)
-                """,
-                (name, mid, list_type),
-            )
+            conn.execute(SQL_INSERT_LIST_ENTRY, (name, mid, list_type))
     return redirect(url_for("index"))
 
 
 @app.route("/lists/<int:entry_id>/toggle", methods=["POST"])
 def toggle_list_entry(entry_id: int):
     with get_connection() as conn:
-        conn.execute(
-            "UPDATE list_entries SET enabled = 1 - enabled WHERE id = ?",
-            (entry_id,),
-        )
+        conn.execute(SQL_TOGGLE_LIST_ENTRY, (entry_id,))
     return redirect(url_for("index"))
 
 
 @app.route("/lists/<int:entry_id>/delete", methods=["POST"])
 def delete_list_entry(entry_id: int):
     with get_connection() as conn:
-        conn.execute("DELETE FROM list_entries WHERE id = ?", (entry_id,))
+        conn.execute(SQL_DELETE_LIST_ENTRY, (entry_id,))
     return redirect(url_for("index"))
 
 